@@ -4,21 +4,179 @@ Creates true Excel PivotTable objects and charts
 Best for: Interactive pivot tables that remain dynamic in Excel
 """
 
+from collections import defaultdict
+
+import numpy as np
 import pandas as pd
 from openpyxl import Workbook, load_workbook
 from openpyxl.chart import BarChart, PieChart, Reference as ChartReference
-from openpyxl.utils.dataframe import dataframe_to_rows
-
-def create_sample_data():
-    """Create sample sales data for demonstration"""
-    data = {
-        'Date': pd.date_range('2024-01-01', periods=100, freq='D'),
-        'Region': ['North', 'South', 'East', 'West'] * 25,
-        'Product': ['Product A', 'Product B', 'Product C', 'Product D'] * 25,
-        'Sales': [100, 150, 200, 175, 120, 180, 210, 190] * 12 + [100, 150, 200, 175],
-        'Quantity': [10, 15, 20, 18, 12, 16, 22, 19] * 12 + [10, 15, 20, 18]
-    }
-    return pd.DataFrame(data)
+
+from sample_data import get_sample_df as create_sample_data
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Kernels precompiled by build_pivot_ext.py (no JIT latency on first call)
+try:
+    import pivot_ext
+    PIVOT_EXT_AVAILABLE = True
+except ImportError:
+    PIVOT_EXT_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True, fastmath=True)
+    def pivot_sum_numba(row_codes, col_codes, values, out):
+        """Accumulate values into the dense (rows x cols) matrix `out` of group sums"""
+        for i in range(values.size):
+            out[row_codes[i], col_codes[i]] += values[i]
+
+    @numba.njit(cache=True, fastmath=True)
+    def group_stats_numba(codes, values, sums, counts):
+        """Accumulate per-group sums and counts in a single pass"""
+        for i in range(values.size):
+            sums[codes[i]] += values[i]
+            counts[codes[i]] += 1
+else:
+    def pivot_sum_numba(row_codes, col_codes, values, out):
+        """Accumulate values into the dense (rows x cols) matrix `out` of group sums"""
+        nr, nc = out.shape
+        flat = np.bincount(row_codes * nc + col_codes, weights=values, minlength=nr * nc)
+        out += flat.reshape(nr, nc).astype(out.dtype)
+
+    def group_stats_numba(codes, values, sums, counts):
+        """Accumulate per-group sums and counts in a single pass"""
+        n = sums.size
+        sums += np.bincount(codes, weights=values, minlength=n).astype(sums.dtype)
+        counts += np.bincount(codes, minlength=n)
+
+# Value dtypes pivot_ext has precompiled kernels for (keys are int64 codes)
+PIVOT_EXT_DTYPES = {
+    np.dtype(np.int32): 'i4',
+    np.dtype(np.int64): 'i8',
+    np.dtype(np.float64): 'f8',
+}
+
+def _get_kernel(name, codes, values, fallback):
+    """Pick the precompiled pivot_ext kernel matching the array dtypes, else `fallback`"""
+    suffix = PIVOT_EXT_DTYPES.get(values.dtype)
+    if PIVOT_EXT_AVAILABLE and suffix and codes.dtype == np.int64:
+        return getattr(pivot_ext, f'{name}_{suffix}')
+    return fallback
+
+def factorize_columns(df, columns):
+    """
+    Factorize key columns once so several pivots can share the codes
+    
+    Args:
+        df: Source DataFrame
+        columns: Names of the key columns to factorize
+    
+    Returns:
+        Dict mapping column name to (codes, uniques)
+    """
+    return {col: pd.factorize(df[col], sort=True) for col in columns}
+
+def _get_codes(df, column, keys):
+    """Look up pre-factorized codes for `column`, factorizing on a miss"""
+    if keys is not None and column in keys:
+        return keys[column]
+    return pd.factorize(df[column], sort=True)
+
+def _get_values(series):
+    """
+    Get a value column for the kernels without widening it
+    
+    Returns:
+        (values, accumulator dtype, mask of non-missing values or None)
+        Integer columns are summed into int64, everything else into float64
+    """
+    if pd.api.types.is_integer_dtype(series) and not series.hasnans:
+        return series.to_numpy(), np.int64, None
+    vals = series.to_numpy(dtype=np.float64)
+    return vals, np.float64, ~np.isnan(vals)
+
+def pivot_sum(df, values, index, columns, keys=None):
+    """
+    Sum `values` grouped by `index` and `columns`
+    Equivalent to pd.pivot_table(..., aggfunc='sum', fill_value=0)
+    
+    Args:
+        df: Source DataFrame
+        values: Name of the numeric column to sum
+        index: Name of the column used for pivot rows
+        columns: Name of the column used for pivot columns
+        keys: Optional output of factorize_columns() to reuse
+    """
+    r_codes, r_uniq = _get_codes(df, index, keys)
+    c_codes, c_uniq = _get_codes(df, columns, keys)
+    vals, acc_dtype, valid = _get_values(df[values])
+    
+    # Drop rows with missing keys/values, like pd.pivot_table does
+    mask = (r_codes >= 0) & (c_codes >= 0)
+    if valid is not None:
+        mask &= valid
+    mat = np.zeros((len(r_uniq), len(c_uniq)), dtype=acc_dtype)
+    kernel = _get_kernel('pivot_sum', r_codes, vals, pivot_sum_numba)
+    kernel(r_codes[mask], c_codes[mask], vals[mask], mat)
+    
+    return pd.DataFrame(
+        mat,
+        index=pd.Index(r_uniq, name=index),
+        columns=pd.Index(c_uniq, name=columns)
+    )
+
+def pivot_stats(df, values, index, keys=None):
+    """
+    Sum, mean and count of `values` grouped by `index`
+    Equivalent to pd.pivot_table(..., aggfunc=['sum', 'mean', 'count'])
+    
+    Args:
+        df: Source DataFrame
+        values: Name of the numeric column to aggregate
+        index: Name of the column used for pivot rows
+        keys: Optional output of factorize_columns() to reuse
+    """
+    codes, uniq = _get_codes(df, index, keys)
+    vals, acc_dtype, valid = _get_values(df[values])
+    
+    mask = codes >= 0
+    if valid is not None:
+        mask &= valid
+    sums = np.zeros(len(uniq), dtype=acc_dtype)
+    counts = np.zeros(len(uniq), dtype=np.int64)
+    kernel = _get_kernel('group_stats', codes, vals, group_stats_numba)
+    kernel(codes[mask], vals[mask], sums, counts)
+    
+    # Groups with no non-missing values get a NaN mean, like pd.pivot_table
+    means = np.divide(sums, counts, out=np.full(len(sums), np.nan), where=counts > 0)
+    
+    return pd.DataFrame(
+        {
+            ('sum', values): sums,
+            ('mean', values): means,
+            ('count', values): counts,
+        },
+        index=pd.Index(uniq, name=index)
+    )
+
+def append_pivot(ws, pivot):
+    """
+    Append a pivot DataFrame to a worksheet: column header row(s), index name row, then data
+    Same layout as dataframe_to_rows(pivot, index=True, header=True), but rows come
+    straight from itertuples instead of per-cell lookups
+    
+    Args:
+        ws: Worksheet to append to
+        pivot: DataFrame with a single-level index
+    """
+    for level in range(pivot.columns.nlevels):
+        ws.append([None] + list(pivot.columns.get_level_values(level)))
+    ws.append([pivot.index.name] + [None] * len(pivot.columns))
+    for row in pivot.itertuples(index=True, name=None):
+        ws.append(row)
 
 def create_pivot_with_openpyxl(input_file=None, output_file='output_openpyxl.xlsx'):
     """
@@ -36,32 +194,28 @@ def create_pivot_with_openpyxl(input_file=None, output_file='output_openpyxl.xls
         df = create_sample_data()
         print("Using sample data (no input file provided)")
     
-    # Create workbook and write raw data first
-    wb = Workbook()
-    ws_data = wb.active
-    ws_data.title = "Raw Data"
+    # Create a write-only workbook so rows are streamed to disk instead of
+    # being held as Cell objects (write-only sheets can still host charts)
+    wb = Workbook(write_only=True)
+    ws_data = wb.create_sheet("Raw Data")
     
     # Write DataFrame to worksheet
-    for r in dataframe_to_rows(df, index=False, header=True):
-        ws_data.append(r)
+    ws_data.append(tuple(df.columns))
+    for row in df.itertuples(index=False, name=None):
+        ws_data.append(row)
     
     # Create pivot table 1 using pandas (simpler approach)
     # Note: Creating true Excel PivotTable with openpyxl is very complex
     # This demonstrates both approaches
     
+    # Factorize the grouping keys once; Product is shared by both pivots
+    keys = factorize_columns(df, ['Region', 'Product'])
+    
     # Method 1: Write pivoted data as regular table
-    pivot1 = pd.pivot_table(
-        df, 
-        values='Sales', 
-        index='Region', 
-        columns='Product', 
-        aggfunc='sum',
-        fill_value=0
-    )
+    pivot1 = pivot_sum(df, values='Sales', index='Region', columns='Product', keys=keys)
     
     ws_pivot1 = wb.create_sheet("Pivot - Sales by Region")
-    for r in dataframe_to_rows(pivot1, index=True, header=True):
-        ws_pivot1.append(r)
+    append_pivot(ws_pivot1, pivot1)
     
     # Create a bar chart from the pivoted data
     chart1 = BarChart()
@@ -83,16 +237,10 @@ def create_pivot_with_openpyxl(input_file=None, output_file='output_openpyxl.xls
     ws_pivot1.add_chart(chart1, "H2")
     
     # Method 2: Create summary statistics
-    pivot2 = pd.pivot_table(
-        df,
-        values='Quantity',
-        index='Product',
-        aggfunc=['sum', 'mean', 'count']
-    )
+    pivot2 = pivot_stats(df, values='Quantity', index='Product', keys=keys)
     
     ws_pivot2 = wb.create_sheet("Pivot - Product Stats")
-    for r in dataframe_to_rows(pivot2, index=True, header=True):
-        ws_pivot2.append(r)
+    append_pivot(ws_pivot2, pivot2)
     
     # Create a pie chart for product distribution
     pie = PieChart()
@@ -146,30 +294,37 @@ def update_existing_excel(input_file, output_file='updated_openpyxl.xlsx'):
     # Assume first sheet has the data
     ws_data = wb.active
     
-    # Convert worksheet to DataFrame
-    data = ws_data.values
-    cols = next(data)
-    df = pd.DataFrame(data, columns=cols)
-    
-    # Create pivot table
-    pivot = pd.pivot_table(
-        df, 
-        values=df.columns[3],  # Assuming 4th column has numeric data
-        index=df.columns[1],   # Assuming 2nd column for rows
-        aggfunc='sum',
-        fill_value=0
+    key_col_idx = 1  # Assuming 2nd column for rows
+    val_col_idx = 3  # Assuming 4th column has numeric data
+    
+    # Sum straight from the cells, reading only the two columns used by the pivot
+    # (skips building a DataFrame of the whole sheet)
+    cols = next(ws_data.iter_rows(max_row=1, values_only=True))
+    sums = defaultdict(int)
+    rows = ws_data.iter_rows(
+        min_row=2,
+        min_col=key_col_idx + 1,
+        max_col=val_col_idx + 1,
+        values_only=True
     )
+    for row in rows:
+        key, value = row[0], row[val_col_idx - key_col_idx]
+        if key is not None and value is not None:
+            sums[key] += value
+    pivot_index = sorted(sums)
     
-    # Add new sheet with pivot
+    # Add new sheet with pivot (same layout as append_pivot)
     ws_pivot = wb.create_sheet("New Pivot")
-    for r in dataframe_to_rows(pivot, index=True, header=True):
-        ws_pivot.append(r)
+    ws_pivot.append([None, cols[val_col_idx]])
+    ws_pivot.append([cols[key_col_idx], None])
+    for key in pivot_index:
+        ws_pivot.append([key, sums[key]])
     
     # Add chart
     chart = BarChart()
     chart.title = "Data Summary"
-    data_ref = ChartReference(ws_pivot, min_col=2, min_row=1, max_row=len(pivot) + 1)
-    cats_ref = ChartReference(ws_pivot, min_col=1, min_row=2, max_row=len(pivot) + 1)
+    data_ref = ChartReference(ws_pivot, min_col=2, min_row=1, max_row=len(pivot_index) + 1)
+    cats_ref = ChartReference(ws_pivot, min_col=1, min_row=2, max_row=len(pivot_index) + 1)
     chart.add_data(data_ref, titles_from_data=True)
     chart.set_categories(cats_ref)
     ws_pivot.add_chart(chart, "E2")
@@ -1,7 +1,10 @@
 import pandas as pd
 import os
+from contextlib import contextmanager
 from pathlib import Path
 
+from sample_data import get_sample_df as create_sample_data
+
 try:
     import win32com.client as win32
     from win32com.client import constants as c
@@ -10,30 +13,46 @@ except ImportError:
     WIN32COM_AVAILABLE = False
     print("pywin32 not installed: pip install pywin32")
 
-def create_sample_data():
-    """Create sample sales data for demonstration
+@contextmanager
+def excel_app():
+    """
+    Start one hidden Excel instance and quit it on exit
+    Pass the yielded application to several pivot builds to pay Excel's startup cost once:
+    
+        with excel_app() as excel:
+            for f in files:
+                create_true_pivot_with_win32com(f, excel=excel)
     """
-    data = {
-        'Date': pd.date_range('2024-01-01', periods=100, freq='D'),
-        'Region': ['North', 'South', 'East', 'West'] * 25,
-        'Product': ['Product A', 'Product B', 'Product C', 'Product D'] * 25,
-        'Sales': [100, 150, 200, 175, 120, 180, 210, 190] * 12 + [100, 150, 200, 175],
-        'Quantity': [10, 15, 20, 18, 12, 16, 22, 19] * 12 + [10, 15, 20, 18]
-    }
-    return pd.DataFrame(data)
+    excel = win32.gencache.EnsureDispatch('Excel.Application')
+    excel.Visible = False  # Set to True if you want to see Excel working
+    excel.DisplayAlerts = False
+    excel.ScreenUpdating = False  # No redraws while workbooks are built
+    excel.EnableEvents = False
+    
+    try:
+        yield excel
+    finally:
+        excel.EnableEvents = True
+        excel.ScreenUpdating = True
+        excel.Quit()
 
-def create_true_pivot_with_win32com(input_file=None, output_file='output_win32com.xlsx'):
+def create_true_pivot_with_win32com(input_file=None, output_file='output_win32com.xlsx', excel=None):
     """
     Excel PivotTables and charts
     Args:
         input_file: Path to input Excel file (if None, uses sample data)
         output_file: Path to output Excel file
+        excel: Running Excel application from excel_app() (if None, starts and quits its own)
     """
     
     if not WIN32COM_AVAILABLE:
         print("ERROR: This function requires pywin32 and Excel to be installed.")
         return
     
+    if excel is None:
+        with excel_app() as excel:
+            return create_true_pivot_with_win32com(input_file, output_file, excel=excel)
+    
     # read or create data
     if input_file:
         df = pd.read_excel(input_file)
@@ -41,28 +60,30 @@ def create_true_pivot_with_win32com(input_file=None, output_file='output_win32co
         df = create_sample_data()
         print("Using sample data (no input file provided)")
     
-    # save data to a temporary Excel file using pandas
-    temp_file = 'temp_data_for_pivot.xlsx'
-    df.to_excel(temp_file, sheet_name='Raw Data', index=False)
+    # Build the raw data as a 2D tuple so it can be pushed to Excel in one COM call
+    # (missing values become None -> empty cells, like df.to_excel)
+    values = df.astype(object).where(df.notna(), None)
+    header = tuple(df.columns)
+    rows = tuple(values.itertuples(index=False, name=None))
+    payload = (header,) + rows
     
     # Convert to absolute path
     abs_output_path = str(Path(output_file).resolve())
-    abs_temp_path = str(Path(temp_file).resolve())
     
-    # Start Excel application
-    excel = win32.gencache.EnsureDispatch('Excel.Application')
-    excel.Visible = False  # Set to True if you want to see Excel working
-    excel.DisplayAlerts = False
+    # Create a new workbook (calculation mode can only be changed once one is open)
+    wb = excel.Workbooks.Add()
+    prev_calc = None
     
     try:
-        # Open the workbook
-        wb = excel.Workbooks.Open(abs_temp_path)
-        ws_data = wb.Worksheets('Raw Data')
+        prev_calc = excel.Calculation
+        excel.Calculation = -4135  # xlCalculationManual
         
-        # Get data range
-        last_row = ws_data.Cells(ws_data.Rows.Count, 1).End(-4162).Row  # xlUp = -4162
-        last_col = ws_data.Cells(1, ws_data.Columns.Count).End(-4159).Column  # xlToLeft = -4159
-        data_range = ws_data.Range(ws_data.Cells(1, 1), ws_data.Cells(last_row, last_col))
+        # Write the raw data in a single range assignment
+        ws_data = wb.Worksheets(1)
+        ws_data.Name = 'Raw Data'
+        
+        data_range = ws_data.Range(ws_data.Cells(1, 1), ws_data.Cells(len(payload), len(header)))
+        data_range.Value = payload
         
         # Create a new sheet for the pivot table
         ws_pivot1 = wb.Worksheets.Add()
@@ -80,22 +101,31 @@ def create_true_pivot_with_win32com(input_file=None, output_file='output_win32co
             TableName="SalesByRegion"
         )
         
-        # Configure PivotTable fields
+        # Configure PivotTable fields (recalculated once when ManualUpdate is cleared)
+        pivot_table1.ManualUpdate = True
+        
+        # Look each PivotField up once and reuse the COM handle
+        region_fld = pivot_table1.PivotFields("Region")
+        product_fld = pivot_table1.PivotFields("Product")
+        sales_fld = pivot_table1.PivotFields("Sales")
+        
         # Add Region to Row
-        pivot_table1.PivotFields("Region").Orientation = 1  # xlRowField
-        pivot_table1.PivotFields("Region").Position = 1
+        region_fld.Orientation = 1  # xlRowField
+        region_fld.Position = 1
         
         # Add Product to Column
-        pivot_table1.PivotFields("Product").Orientation = 2  # xlColumnField
-        pivot_table1.PivotFields("Product").Position = 1
+        product_fld.Orientation = 2  # xlColumnField
+        product_fld.Position = 1
         
         # Add Sales to Values
         pivot_table1.AddDataField(
-            pivot_table1.PivotFields("Sales"),
+            sales_fld,
             "Sum of Sales",
             -4157  # xlSum
         )
         
+        pivot_table1.ManualUpdate = False
+        
         # Apply style
         pivot_table1.TableStyle2 = "PivotStyleMedium9"
         
@@ -117,32 +147,32 @@ def create_true_pivot_with_win32com(input_file=None, output_file='output_win32co
         ws_pivot2 = wb.Worksheets.Add()
         ws_pivot2.Name = "Pivot - Product Stats"
         
-        pivot_cache2 = wb.PivotCaches().Create(
-            SourceType=1,
-            SourceData=data_range
-        )
-        
-        pivot_table2 = pivot_cache2.CreatePivotTable(
+        # Reuse the first PivotCache - both pivots read the same source range
+        pivot_table2 = pivot_cache.CreatePivotTable(
             TableDestination=ws_pivot2.Range("A3"),
             TableName="ProductStats"
         )
         
         # Configure second PivotTable
+        pivot_table2.ManualUpdate = True
         pivot_table2.PivotFields("Product").Orientation = 1  # xlRowField
         
         # Add multiple value fields
+        quantity_fld = pivot_table2.PivotFields("Quantity")
         pivot_table2.AddDataField(
-            pivot_table2.PivotFields("Quantity"),
+            quantity_fld,
             "Sum of Quantity",
             -4157  # xlSum
         )
         
         pivot_table2.AddDataField(
-            pivot_table2.PivotFields("Quantity"),
+            quantity_fld,
             "Average Quantity",
             -4106  # xlAverage
         )
         
+        pivot_table2.ManualUpdate = False
+        
         pivot_table2.TableStyle2 = "PivotStyleMedium2"
         
         # Create a pie chart for product distribution
@@ -168,64 +198,75 @@ def create_true_pivot_with_win32com(input_file=None, output_file='output_win32co
         ws_summary.Name = "Summary"
         wb.Worksheets("Summary").Move(Before=wb.Worksheets(1))
         
-        ws_summary.Range("A1").Value = "Excel PivotTable Summary"
-        ws_summary.Range("A1").Font.Size = 16
-        ws_summary.Range("A1").Font.Bold = True
-        
-        ws_summary.Range("A3").Value = "This workbook contains TRUE Excel PivotTables created with win32com"
-        ws_summary.Range("A5").Value = "Features:"
-        ws_summary.Range("A6").Value = "✓ Interactive PivotTables that can be modified in Excel"
-        ws_summary.Range("A7").Value = "✓ Charts linked to PivotTables (update when pivot refreshes)"
-        ws_summary.Range("A8").Value = "✓ Full Excel functionality preserved"
-        ws_summary.Range("A9").Value = "✓ Users can drag/drop fields, filter, and refresh data"
+        # Write all summary lines in a single range assignment (None = blank row)
+        summary_rows = (
+            ("Excel PivotTable Summary",),
+            (None,),
+            ("This workbook contains TRUE Excel PivotTables created with win32com",),
+            (None,),
+            ("Features:",),
+            ("✓ Interactive PivotTables that can be modified in Excel",),
+            ("✓ Charts linked to PivotTables (update when pivot refreshes)",),
+            ("✓ Full Excel functionality preserved",),
+            ("✓ Users can drag/drop fields, filter, and refresh data",),
+            (None,),
+            ("Sheets in this workbook:",),
+            ("• Raw Data: Original data source",),
+            ("• Pivot - Sales by Region: PivotTable with column chart",),
+            ("• Pivot - Product Stats: PivotTable with pie chart",),
+        )
+        ws_summary.Range(ws_summary.Cells(1, 1), ws_summary.Cells(len(summary_rows), 1)).Value = summary_rows
         
-        ws_summary.Range("A11").Value = "Sheets in this workbook:"
-        ws_summary.Range("A12").Value = "• Raw Data: Original data source"
-        ws_summary.Range("A13").Value = "• Pivot - Sales by Region: PivotTable with column chart"
-        ws_summary.Range("A14").Value = "• Pivot - Product Stats: PivotTable with pie chart"
+        title_font = ws_summary.Range("A1").Font
+        title_font.Size = 16
+        title_font.Bold = True
         
         # Auto-fit columns
         ws_summary.Columns("A:A").ColumnWidth = 60
         
+        # Restore calculation before saving, otherwise the file opens in manual mode
+        excel.Calculation = prev_calc
+        
         # Save as new file
         if os.path.exists(abs_output_path):
             os.remove(abs_output_path)
         
-        wb.SaveAs(abs_output_path)
-        wb.Close()
+        wb.SaveAs(abs_output_path, FileFormat=51)  # xlOpenXMLWorkbook
         
     except Exception as e:
         print(f"ERROR: {e}")
         raise
     
     finally:
-        # Clean up
-        excel.Quit()
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
+        # Clean up - leave the (possibly shared) Excel instance as we found it
+        if prev_calc is not None:
+            excel.Calculation = prev_calc
+        wb.Close(SaveChanges=False)
 
-def add_pivot_to_existing_file(input_file, output_file='updated_win32com.xlsx'):
+def add_pivot_to_existing_file(input_file, output_file='updated_win32com.xlsx', excel=None):
     """
     Add PivotTable to an existing Excel file
     
     Args:
         input_file: Path to existing Excel file
         output_file: Path to save updated file
+        excel: Running Excel application from excel_app() (if None, starts and quits its own)
     """
     
     if not WIN32COM_AVAILABLE:
         print("ERROR: This function requires pywin32 and Excel to be installed.")
         return
     
+    if excel is None:
+        with excel_app() as excel:
+            return add_pivot_to_existing_file(input_file, output_file, excel=excel)
+    
     abs_input_path = str(Path(input_file).resolve())
     abs_output_path = str(Path(output_file).resolve())
     
-    excel = win32.gencache.EnsureDispatch('Excel.Application')
-    excel.Visible = False
-    excel.DisplayAlerts = False
+    wb = excel.Workbooks.Open(abs_input_path)
     
     try:
-        wb = excel.Workbooks.Open(abs_input_path)
         ws_data = wb.Worksheets(1)  # First sheet
         
         # Get data range
@@ -250,14 +291,13 @@ def add_pivot_to_existing_file(input_file, output_file='updated_win32com.xlsx'):
         
         # Configure with first available fields
         # This is a generic example - adjust based on your data
-        fields = [pivot_table.PivotFields(i) for i in range(1, min(4, last_col + 1))]
+        fields = [pivot_table.PivotFields(i) for i in range(1, min(3, last_col + 1))]
         
         if len(fields) >= 2:
             fields[0].Orientation = 1  # Row field
             fields[1].Orientation = 4  # Data field
         
         wb.SaveAs(abs_output_path)
-        wb.Close()
         
         print(f"PivotTable added to existing file: {output_file}")
         
@@ -266,7 +306,7 @@ def add_pivot_to_existing_file(input_file, output_file='updated_win32com.xlsx'):
         raise
     
     finally:
-        excel.Quit()
+        wb.Close(SaveChanges=False)
 
 # main
 if __name__ == "__main__":
@@ -277,6 +317,11 @@ if __name__ == "__main__":
         # Create from sample data -> for example
         create_true_pivot_with_win32com()  #add input file here as argument 
         
+        # Build several workbooks with a single Excel instance
+        # with excel_app() as excel:
+        #     create_true_pivot_with_win32com(output_file='output_win32com.xlsx', excel=excel)
+        #     add_pivot_to_existing_file('output_win32com.xlsx', 'updated_win32com.xlsx', excel=excel)
+        
         # Add pivot to existing file 
         # add_pivot_to_existing_file('your_input_file.xlsx', 'updated_win32com.xlsx')
         
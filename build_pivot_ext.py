@@ -0,0 +1,31 @@
+"""
+Ahead-of-time compile the approach 2 pivot kernels into a native `pivot_ext` module
+Run once with: python build_pivot_ext.py
+Without pivot_ext, the kernels are JIT-compiled by Numba on first use
+"""
+
+import os
+
+from numba.pycc import CC
+
+from approach2_openpyxl import PIVOT_EXT_DTYPES, group_stats_numba, pivot_sum_numba
+
+cc = CC('pivot_ext')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# One export per value dtype; integers accumulate into int64, floats into float64
+for suffix in PIVOT_EXT_DTYPES.values():
+    acc = 'f8' if suffix == 'f8' else 'i8'
+    cc.export(
+        f'pivot_sum_{suffix}',
+        f'void(i8[:], i8[:], {suffix}[:], {acc}[:, :])'
+    )(pivot_sum_numba.py_func)
+    cc.export(
+        f'group_stats_{suffix}',
+        f'void(i8[:], {suffix}[:], {acc}[:], i8[:])'
+    )(group_stats_numba.py_func)
+
+# main
+if __name__ == "__main__":
+    cc.compile()
+    print(f"✓ Built pivot_ext in {cc.output_dir}")
@@ -0,0 +1,26 @@
+"""
+Run every approach as a suite
+Each approach writes its own output file, so they run in separate processes in parallel
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+from approach2_openpyxl import create_pivot_with_openpyxl
+from approach3_win32com import WIN32COM_AVAILABLE, create_true_pivot_with_win32com
+
+def run_all():
+    """Create the sample outputs of all available approaches concurrently"""
+    jobs = [create_pivot_with_openpyxl]
+    
+    # win32com needs Windows + Excel; its own process also isolates the COM apartment
+    if WIN32COM_AVAILABLE:
+        jobs.append(create_true_pivot_with_win32com)
+    
+    with ProcessPoolExecutor(max_workers=len(jobs)) as ex:
+        futs = [ex.submit(job) for job in jobs]
+        for fut in futs:
+            fut.result()
+
+# main
+if __name__ == "__main__":
+    run_all()
@@ -0,0 +1,37 @@
+"""
+Shared sample data for the pivot table approaches
+Built once per process and reused by every approach
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+@lru_cache(maxsize=1)
+def get_sample_df():
+    """
+    Create sample sales data for demonstration
+    
+    The DataFrame is cached and shared between callers, so treat it as read-only
+    (take a copy before modifying it).
+    """
+    # Dictionary-encode the grouping keys so pivots work on small integer codes
+    # instead of hashing every string
+    regions = pd.Categorical(np.tile(np.array(['North', 'South', 'East', 'West']), 25))
+    products = pd.Categorical(np.tile(np.array(['Product A', 'Product B', 'Product C', 'Product D']), 25))
+    
+    sales_pattern = np.array([100, 150, 200, 175, 120, 180, 210, 190], dtype=np.int32)
+    sales = np.concatenate([np.tile(sales_pattern, 12), sales_pattern[:4]])
+    
+    quantity_pattern = np.array([10, 15, 20, 18, 12, 16, 22, 19], dtype=np.int32)
+    quantity = np.concatenate([np.tile(quantity_pattern, 12), quantity_pattern[:4]])
+    
+    data = {
+        'Date': pd.date_range('2024-01-01', periods=100, freq='D'),
+        'Region': regions,
+        'Product': products,
+        'Sales': sales,
+        'Quantity': quantity
+    }
+    return pd.DataFrame(data)